@@ -1,4 +1,8 @@
 ### Required Libraries ###
+import json
+import math
+import os
+from bisect import bisect_left
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
@@ -13,6 +17,16 @@ def parse_int(n):
         return float("nan")
 
 
+def parse_float(n):
+    """
+    Securely converts a non-numeric value to float.
+    """
+    try:
+        return float(n)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
 def build_validation_result(is_valid, violated_slot, message_content):
     """
     Define a result message structured as Lex response.
@@ -58,6 +72,257 @@ def validate_data(year, intent_request):
     # A True results is returned if year valid
     return build_validation_result(True, None, None)
 
+### Rating Prediction Helper Functions ###
+# Top 5 TF-IDF words of the ratings model in the_office_nlp.ipynb, in bit order
+RATING_WORDS = ["Michael", "Dwight", "Jim", "Office", "Andy"]
+
+# Names match however they are typed or transcribed, but "Office" keeps its case
+# so "works at the office" is not taken for the show itself
+RATING_EXACT_WORDS = ["Office"]
+
+# Predicted rating for every combination of words, keyed by bitmask
+# (bit i set when RATING_WORDS[i] appears). Generated by Models/rating_model.py
+RATING_TABLE = {
+    0: 9.25, 1: 8.93, 2: 9.26, 3: 9.04, 4: 8.94, 5: 8.85, 6: 8.91, 7: 8.95,
+    8: 9.3, 9: 9.13, 10: 9.33, 11: 9.2, 12: 9.04, 13: 9.09, 14: 9.03, 15: 9.17,
+    16: 9.38, 17: 9.18, 18: 9.26, 19: 8.75, 20: 9.25, 21: 9.15, 22: 9.21, 23: 8.99,
+    24: 9.4, 25: 9.32, 26: 9.32, 27: 9.06, 28: 9.3, 29: 9.3, 30: 9.28, 31: 9.23,
+}
+
+
+def build_matcher(words, exact_words=()):
+    """
+    Builds an Aho-Corasick automaton so all words are found in a single pass.
+    Returns the goto, fail and output tables, where output holds a bitmask,
+    and the exact table of bits whose word must also match case.
+    """
+    goto = [{}]
+    fail = [0]
+    output = [0]
+    exact = {bit: word for bit, word in enumerate(words) if word in exact_words}
+
+    # Build the trie of lowercased words; exact words are checked on a match
+    for bit, word in enumerate(words):
+        state = 0
+        for char in word.lower():
+            if char not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                output.append(0)
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        output[state] |= 1 << bit
+
+    # Breadth first pass to set failure links
+    queue = list(goto[0].values())
+    for state in queue:
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0) if state else 0
+            output[next_state] |= output[fail[next_state]]
+
+    return goto, fail, output, exact
+
+
+# Built once per Lambda container, not per request
+RATING_MATCHER = build_matcher(RATING_WORDS, RATING_EXACT_WORDS)
+
+
+def match_flags(text, matcher=RATING_MATCHER):
+    """
+    Returns the bitmask of words found anywhere in the text.
+    Words match in any case, except exact words which must match the text
+    as written, so "the office" does not set the "Office" flag.
+    """
+    goto, fail, output, exact = matcher
+    state = 0
+    flags = 0
+    for end, char in enumerate(text, 1):
+        char = char.lower()
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        found = output[state]
+        for bit, word in exact.items():
+            if found >> bit & 1 and text[end - len(word):end] != word:
+                found &= ~(1 << bit)
+        flags |= found
+    return flags
+
+
+def validate_rating_data(episode_about):
+    """
+    Validates that the user described the episode.
+    """
+    if episode_about is None or not episode_about.strip():
+        return build_validation_result(
+            False,
+            "EpisodeAbout",
+            "What would the episode be about? For example: Michael and Dwight go on a sales call.",
+        )
+
+    # A True results is returned if data is valid
+    return build_validation_result(True, None, None)
+
+### Availability Index Helper Functions ###
+# Built by Models/availability_index.py from Resources/tv_shows.csv
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "availability_index.json")
+
+# Spoken or typed names for each platform in the index
+PLATFORM_ALIASES = {
+    "netflix": "Netflix",
+    "hulu": "Hulu",
+    "prime video": "Prime Video",
+    "prime": "Prime Video",
+    "amazon prime": "Prime Video",
+    "amazon prime video": "Prime Video",
+    "amazon": "Prime Video",
+    "disney+": "Disney+",
+    "disney plus": "Disney+",
+    "disney": "Disney+",
+}
+
+
+def load_availability_index(path=INDEX_PATH):
+    """
+    Loads the index and precomputes one bitset per platform and per year.
+    Bit i of a bitset stands for the i-th title, titles being sorted best first,
+    so queries are bitwise ANDs instead of scans over the titles.
+    """
+    with open(path) as f:
+        index = json.load(f)
+
+    platforms = index["platforms"]
+    platform_bits = {platform: 0 for platform in platforms}
+    year_bits = {}
+    title_ids = {}
+
+    for i, (title, year, availability) in enumerate(
+        zip(index["titles"], index["years"], index["availability"])
+    ):
+        bit = 1 << i
+        for p, platform in enumerate(platforms):
+            if availability >> p & 1:
+                platform_bits[platform] |= bit
+        year_bits[year] = year_bits.get(year, 0) | bit
+        title_ids.setdefault(title.lower(), []).append(i)
+
+    index["platform_bits"] = platform_bits
+    index["year_bits"] = year_bits
+    index["title_ids"] = title_ids
+    # Negated IMDb scores ascend, so bisect finds how many titles beat a score
+    index["imdb_desc"] = [-score for score in index["imdb"]]
+    return index
+
+
+# Loaded on first use and kept for the life of the Lambda container, so the
+# other intents keep working if the index file was not deployed
+AVAILABILITY_INDEX = None
+
+
+def get_availability_index():
+    """
+    Returns the availability index, loading it on first use.
+    """
+    global AVAILABILITY_INDEX
+    if AVAILABILITY_INDEX is None:
+        if not os.path.exists(INDEX_PATH):
+            raise Exception(
+                "availability_index.json is missing. Build it with Models/availability_index.py "
+                "and deploy it next to the Lambda function."
+            )
+        AVAILABILITY_INDEX = load_availability_index()
+    return AVAILABILITY_INDEX
+
+
+def platform_name(value):
+    """
+    Maps a slot value such as "prime" to the platform name in the index.
+    """
+    if value is None:
+        return None
+    return PLATFORM_ALIASES.get(value.strip().lower())
+
+
+def above_score_bits(min_score, index):
+    """
+    Returns the bitset of titles with an IMDb score strictly above min_score.
+    """
+    # Scores are stored in tenths, so "above 8.55" means at least 8.6
+    count = bisect_left(index["imdb_desc"], -math.floor(min_score * 10))
+    return (1 << count) - 1
+
+
+def best_titles(bits, index, limit=5):
+    """
+    Returns the first titles of a bitset, best first, as (title, year, score).
+    """
+    results = []
+    while bits and len(results) < limit:
+        lowest = bits & -bits
+        i = lowest.bit_length() - 1
+        results.append((index["titles"][i], index["years"][i], index["imdb"][i] / 10))
+        bits ^= lowest
+    return results
+
+
+def describe_titles(titles):
+    """
+    Formats (title, year, score) tuples for a bot message.
+    """
+    return ", ".join(f"{title} ({year}, IMDb {score})" for title, year, score in titles)
+
+
+# Prompts used when a required availability slot is empty
+AVAILABILITY_PROMPTS = {
+    "SeriesTitle": "Which tv show would you like to watch?",
+    "Platform": "Which platform? We carry Netflix, Hulu, Prime Video and Disney+.",
+    "SecondPlatform": "And which other platform? We carry Netflix, Hulu, Prime Video and Disney+.",
+    "year": "Which year are you interested in?",
+    "MinScore": "Above which IMDb score?",
+}
+
+
+def validate_availability_data(slots):
+    """
+    Validates the title, platform, year and score slots provided by the user.
+    Every slot passed in is required, since fulfillment needs all of them.
+    """
+    for slot, value in slots.items():
+        # Ask for any slot that is still empty
+        if value is None or not str(value).strip():
+            return build_validation_result(False, slot, AVAILABILITY_PROMPTS[slot])
+
+        # Validate that every platform is one we carry
+        if slot in ("Platform", "SecondPlatform") and platform_name(value) is None:
+            return build_validation_result(
+                False,
+                slot,
+                "Sorry! We only carry Netflix, Hulu, Prime Video and Disney+. Please try again.",
+            )
+
+        # Validate the year is a whole number
+        if slot == "year" and math.isnan(parse_int(value)):
+            return build_validation_result(
+                False,
+                slot,
+                "Sorry! The year must be a number such as 2018. Please try again.",
+            )
+
+        # Validate the score is between 0 and 10
+        if slot == "MinScore" and not 0 <= parse_float(value) <= 10:
+            return build_validation_result(
+                False,
+                slot,
+                "Sorry! The IMDb score must be a number between 0 and 10. Please try again.",
+            )
+
+    # A True results is returned if data is valid
+    return build_validation_result(True, None, None)
+
 ### Dialog Actions Helper Functions ###
 def get_slots(intent_request):
     """
@@ -750,7 +1015,216 @@ def get_imdb_score(intent_request):
             ),
         },
     )
-    
+
+# predict_rating intent handler
+def predict_rating(intent_request):
+    """
+    Performs dialog management and fulfillment for PredictRating intent.
+    """
+
+    slots = get_slots(intent_request)
+    episode_about = slots["EpisodeAbout"]
+    source = intent_request["invocationSource"]
+
+    if source == "DialogCodeHook":
+        # Ask again for an empty description instead of rating nothing
+        validation_result = validate_rating_data(episode_about)
+
+        if not validation_result["isValid"]:
+            slots[validation_result["violatedSlot"]] = None  # Cleans invalid slot
+
+            return elicit_slot(
+                intent_request["sessionAttributes"],
+                intent_request["currentIntent"]["name"],
+                slots,
+                validation_result["violatedSlot"],
+                validation_result["message"],
+            )
+
+        output_session_attributes = intent_request["sessionAttributes"]
+
+        return delegate(output_session_attributes, get_slots(intent_request))
+
+    # Flags the top 5 words in one pass and looks up the precomputed prediction
+    flags = match_flags(episode_about)
+    predicted_rating = RATING_TABLE[flags]
+    matched_words = [word for bit, word in enumerate(RATING_WORDS) if flags >> bit & 1]
+    # Return a message with the predicted rating
+    return close(
+        intent_request["sessionAttributes"],
+        "Fulfilled",
+        {
+            "contentType": "PlainText",
+            "content": f"""Based on our model, an episode of The Office about {episode_about}
+            would receive a predicted IMDb rating of {predicted_rating}
+            (key words found: {", ".join(matched_words) if matched_words else "none"}).
+            """,
+        },
+    )
+
+# get_platforms intent handler
+def get_platforms(intent_request):
+    """
+    Performs dialog management and fulfillment for GetPlatforms intent.
+    """
+
+    slots = get_slots(intent_request)
+    series_title = slots["SeriesTitle"]
+    source = intent_request["invocationSource"]
+
+    if source == "DialogCodeHook":
+        # Any title can be asked for, so only check that one was given
+        validation_result = validate_availability_data({"SeriesTitle": series_title})
+
+        if not validation_result["isValid"]:
+            slots[validation_result["violatedSlot"]] = None  # Cleans invalid slot
+
+            return elicit_slot(
+                intent_request["sessionAttributes"],
+                intent_request["currentIntent"]["name"],
+                slots,
+                validation_result["violatedSlot"],
+                validation_result["message"],
+            )
+
+        output_session_attributes = intent_request["sessionAttributes"]
+
+        return delegate(output_session_attributes, get_slots(intent_request))
+
+    # Looks the title up directly; remakes share a title, so there may be several
+    index = get_availability_index()
+    title_ids = index["title_ids"].get(series_title.strip().lower(), [])
+    answers = []
+    for i in title_ids:
+        platforms = [p for bit, p in enumerate(index["platforms"]) if index["availability"][i] >> bit & 1]
+        answer = f"{index['titles'][i]} ({index['years'][i]}) is on {' and '.join(platforms) or 'none of our platforms'}"
+        if index["rotten"][i] >= 0:
+            answer += f" with {index['rotten'][i]}% on Rotten Tomatoes"
+        answers.append(answer)
+
+    if not answers:
+        content = f"Sorry! We couldn't find a tv show titled {series_title} in our data."
+    else:
+        content = f"Based on our data, {'; '.join(answers)}."
+
+    return close(
+        intent_request["sessionAttributes"],
+        "Fulfilled",
+        {"contentType": "PlainText", "content": content},
+    )
+
+# get_best_on_platform intent handler
+def get_best_on_platform(intent_request):
+    """
+    Performs dialog management and fulfillment for GetBestOnPlatform intent.
+    """
+
+    slots = get_slots(intent_request)
+    platform = slots["Platform"]
+    year = slots["year"]
+    source = intent_request["invocationSource"]
+
+    if source == "DialogCodeHook":
+        # Validates user's input using the validate_availability_data function
+        validation_result = validate_availability_data({"Platform": platform, "year": year})
+
+        # If the data provided by the user is not valid,
+        # the elicitSlot dialog action is used to re-prompt for the first violation detected.
+        if not validation_result["isValid"]:
+            slots[validation_result["violatedSlot"]] = None  # Cleans invalid slot
+
+            return elicit_slot(
+                intent_request["sessionAttributes"],
+                intent_request["currentIntent"]["name"],
+                slots,
+                validation_result["violatedSlot"],
+                validation_result["message"],
+            )
+
+        output_session_attributes = intent_request["sessionAttributes"]
+
+        return delegate(output_session_attributes, get_slots(intent_request))
+
+    # Intersects the platform and year bitsets; bits come out best first
+    index = get_availability_index()
+    platform = platform_name(platform)
+    bits = index["platform_bits"][platform] & index["year_bits"].get(parse_int(year), 0)
+    best = best_titles(bits, index)
+
+    if not best:
+        content = f"Sorry! We couldn't find any {platform} shows from {year}."
+    else:
+        content = f"""Based on our data, the best {platform} shows from {year} are
+            {describe_titles(best)}.
+            """
+
+    return close(
+        intent_request["sessionAttributes"],
+        "Fulfilled",
+        {"contentType": "PlainText", "content": content},
+    )
+
+# get_shared_shows intent handler
+def get_shared_shows(intent_request):
+    """
+    Performs dialog management and fulfillment for GetSharedShows intent.
+    """
+
+    slots = get_slots(intent_request)
+    platform = slots["Platform"]
+    second_platform = slots["SecondPlatform"]
+    min_score = slots["MinScore"]
+    source = intent_request["invocationSource"]
+
+    if source == "DialogCodeHook":
+        # Validates user's input using the validate_availability_data function
+        validation_result = validate_availability_data(
+            {"Platform": platform, "SecondPlatform": second_platform, "MinScore": min_score}
+        )
+
+        # If the data provided by the user is not valid,
+        # the elicitSlot dialog action is used to re-prompt for the first violation detected.
+        if not validation_result["isValid"]:
+            slots[validation_result["violatedSlot"]] = None  # Cleans invalid slot
+
+            return elicit_slot(
+                intent_request["sessionAttributes"],
+                intent_request["currentIntent"]["name"],
+                slots,
+                validation_result["violatedSlot"],
+                validation_result["message"],
+            )
+
+        output_session_attributes = intent_request["sessionAttributes"]
+
+        return delegate(output_session_attributes, get_slots(intent_request))
+
+    # Intersects both platforms with the titles above the score
+    index = get_availability_index()
+    platform = platform_name(platform)
+    second_platform = platform_name(second_platform)
+    min_score = parse_float(min_score)
+    bits = (
+        index["platform_bits"][platform]
+        & index["platform_bits"][second_platform]
+        & above_score_bits(min_score, index)
+    )
+    best = best_titles(bits, index)
+    total = bin(bits).count("1")
+
+    if not best:
+        content = f"Sorry! No shows on both {platform} and {second_platform} have an IMDb score above {min_score}."
+    else:
+        content = f"""Based on our data, {total} shows on both {platform} and {second_platform}
+            have an IMDb score above {min_score}. The best are {describe_titles(best)}.
+            """
+
+    return close(
+        intent_request["sessionAttributes"],
+        "Fulfilled",
+        {"contentType": "PlainText", "content": content},
+    )
+
 ### Intents Dispatcher ###
 def dispatch(intent_request):
     """
@@ -769,6 +1243,18 @@ def dispatch(intent_request):
     if intent_name == "GetIMDbScore":
         return get_imdb_score(intent_request)
 
+    if intent_name == "PredictRating":
+        return predict_rating(intent_request)
+
+    if intent_name == "GetPlatforms":
+        return get_platforms(intent_request)
+
+    if intent_name == "GetBestOnPlatform":
+        return get_best_on_platform(intent_request)
+
+    if intent_name == "GetSharedShows":
+        return get_shared_shows(intent_request)
+
     raise Exception("Intent with name " + intent_name + " not supported")
     
 ### Main Handler ###
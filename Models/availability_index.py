@@ -0,0 +1,70 @@
+### Required Libraries ###
+import argparse
+import json
+
+import pandas as pd
+
+from paths import CUI_DIR, TV_SHOWS_CSV
+
+INDEX_JSON = CUI_DIR / "availability_index.json"
+
+# Bit i of a title's availability is set when it streams on PLATFORMS[i]
+PLATFORMS = ["Netflix", "Hulu", "Prime Video", "Disney+"]
+
+
+def parse_percent(value):
+    """
+    Converts a Rotten Tomatoes string like "96%" to 96, or -1 when missing.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return -1
+    return int(value.strip().rstrip("%"))
+
+
+def build_index(csv_path=TV_SHOWS_CSV):
+    """
+    Builds the ratings and availability index served by the bot.
+
+    Titles are sorted best first (IMDb, then Rotten Tomatoes) so that the bot
+    can answer "above a score" queries with a prefix of the list. Scores are
+    stored as integers: IMDb in tenths and Rotten Tomatoes in percent, -1 when
+    missing. Availability is one small integer per title, a bitmask over
+    PLATFORMS.
+    """
+    tv_shows_df = pd.read_csv(csv_path)
+
+    tv_shows_df["imdb"] = (tv_shows_df["IMDb"] * 10).round().fillna(-1).astype(int)
+    tv_shows_df["rotten"] = tv_shows_df["Rotten Tomatoes"].apply(parse_percent)
+    tv_shows_df["availability"] = 0
+    for bit, platform in enumerate(PLATFORMS):
+        tv_shows_df["availability"] |= tv_shows_df[platform].astype(int) * (1 << bit)
+
+    tv_shows_df = tv_shows_df.sort_values(
+        ["imdb", "rotten", "Title"], ascending=[False, False, True], kind="mergesort"
+    )
+
+    return {
+        "platforms": PLATFORMS,
+        "titles": tv_shows_df["Title"].tolist(),
+        "years": tv_shows_df["Year"].astype(int).tolist(),
+        "imdb": tv_shows_df["imdb"].tolist(),
+        "rotten": tv_shows_df["rotten"].tolist(),
+        "availability": tv_shows_df["availability"].tolist(),
+    }
+
+
+### Main Function ###
+def main():
+    parser = argparse.ArgumentParser(description="Build the availability index for the bot.")
+    parser.add_argument("--output", default=str(INDEX_JSON), help="JSON file to write.")
+    args = parser.parse_args()
+
+    index = build_index()
+    with open(args.output, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+    print(f"Indexed {len(index['titles'])} titles into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
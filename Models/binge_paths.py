@@ -0,0 +1,239 @@
+### Required Libraries ###
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from paths import FRIENDS_CSV, OFFICE_CSV
+
+# Column layout and main characters of every series we carry
+SERIES = {
+    "friends": {
+        "csv": FRIENDS_CSV,
+        "encoding": "latin-1",
+        "title": "Episode_Title",
+        "text": "Summary",
+        "rating": "Stars",
+        "order": ["Season", "Episode Number"],
+        "characters": ["Monica", "Rachel", "Ross", "Chandler", "Joey", "Phoebe"],
+    },
+    "office": {
+        "csv": OFFICE_CSV,
+        "encoding": "utf-8",
+        "title": "EpisodeTitle",
+        "text": "About",
+        "rating": "Ratings",
+        "order": [],
+        "characters": [
+            "Michael", "Dwight", "Jim", "Pam", "Andy", "Angela", "Kevin", "Oscar",
+            "Ryan", "Kelly", "Erin", "Toby", "Stanley", "Phyllis", "Creed",
+            "Meredith", "Darryl", "Holly", "Jan", "Gabe", "Nellie", "Robert",
+        ],
+    },
+}
+
+
+### Graph Helper Functions ###
+def load_episodes(series):
+    """
+    Reads a series' episodes in air order with a common set of columns.
+    """
+    config = SERIES[series]
+    df = pd.read_csv(config["csv"], encoding=config["encoding"])
+    if config["order"]:
+        df = df.sort_values(config["order"])
+    df = df.reset_index(drop=True)
+    return pd.DataFrame({
+        "title": df[config["title"]],
+        "text": df[config["text"]].fillna(""),
+        "rating": df[config["rating"]],
+    })
+
+
+def character_matrix(texts, characters):
+    """
+    Returns a sparse episode x character matrix of which characters appear.
+    """
+    patterns = [re.compile(rf"\b{name}\b") for name in characters]
+    flags = np.array([[bool(pattern.search(text)) for pattern in patterns] for text in texts])
+    return sparse.csr_matrix(flags.astype(np.float64))
+
+
+def build_graph(episodes, characters, text_weight=0.6, next_weight=0.5, top_k=10):
+    """
+    Builds the weighted episode graph as a sparse row-stochastic matrix.
+
+    Edge weights mix summary cosine similarity (TF-IDF) with the share of
+    characters two episodes have in common. Each episode keeps its top_k
+    strongest edges, plus an edge to the next episode so that watching in
+    order is always an option.
+    """
+    n = len(episodes)
+
+    tfidf = TfidfVectorizer(stop_words="english").fit_transform(episodes["text"])
+    similarity = cosine_similarity(tfidf, dense_output=True)
+
+    cast = character_matrix(episodes["text"], characters)
+    shared = (cast @ cast.T).toarray()
+    cast_size = np.asarray(cast.sum(axis=1)).ravel()
+    # Jaccard overlap of the two casts
+    union = cast_size[:, None] + cast_size[None, :] - shared
+    shared = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    weights = text_weight * similarity + (1 - text_weight) * shared
+    np.fill_diagonal(weights, 0)
+
+    # Keep only the strongest edges per episode
+    if top_k < n - 1:
+        cutoff = np.partition(weights, -top_k, axis=1)[:, -top_k][:, None]
+        weights = np.where(weights >= cutoff, weights, 0)
+
+    order = np.arange(n - 1)
+    weights[order, order + 1] += next_weight
+
+    adjacency = sparse.csr_matrix(weights)
+    return normalize_rows(adjacency), cast
+
+
+def normalize_rows(adjacency):
+    """
+    Scales every row to sum to one; rows without edges stay empty.
+    """
+    totals = np.asarray(adjacency.sum(axis=1)).ravel()
+    inverse = np.divide(1.0, totals, out=np.zeros_like(totals), where=totals > 0)
+    return sparse.diags(inverse) @ adjacency
+
+
+### Walk Helper Functions ###
+def reach_matrix(transitions, steps=5):
+    """
+    Averages the random walk distributions over the first steps transitions.
+
+    Entry (i, j) is the share of a steps-long binge from episode i spent on
+    episode j. All starting episodes are walked at once with sparse products.
+    """
+    current = transitions
+    total = transitions.copy()
+    for _ in range(steps - 1):
+        current = current @ transitions
+        total = total + current
+    return (total / steps).toarray()
+
+
+def binge_paths(transitions, length=5):
+    """
+    Follows the most likely unvisited next episode from every start at once.
+
+    Returns an episodes x (length + 1) array of episode indices, -1 once a walk
+    has nowhere left to go.
+    """
+    dense = transitions.toarray()
+    n = dense.shape[0]
+    starts = np.arange(n)
+
+    paths = np.full((n, length + 1), -1)
+    paths[:, 0] = starts
+    visited = np.zeros((n, n), dtype=bool)
+    visited[starts, starts] = True
+    current = starts.copy()
+    alive = np.ones(n, dtype=bool)
+
+    for step in range(1, length + 1):
+        scores = np.where(visited, -1.0, dense[current])
+        best = scores.argmax(axis=1)
+        alive &= scores[starts, best] > 0
+        paths[alive, step] = best[alive]
+        visited[starts[alive], best[alive]] = True
+        current = np.where(alive, best, current)
+
+    return paths
+
+
+def skip_to(reach, ratings, min_gap=2, count=3):
+    """
+    Ranks later episodes each episode is likely to skip ahead to.
+
+    Only episodes at least min_gap ahead count as skips. Reach is weighted by
+    rating so that likely and well reviewed episodes come first.
+    """
+    n = reach.shape[0]
+    gap = np.arange(n)[None, :] - np.arange(n)[:, None]
+    scores = np.where(gap >= min_gap, reach * np.asarray(ratings)[None, :], 0)
+    ranked = np.argsort(-scores, axis=1)[:, :count]
+    ranked_scores = np.take_along_axis(scores, ranked, axis=1)
+    return np.where(ranked_scores > 0, ranked, -1)
+
+
+def skip_rates(transitions, cast, characters, min_gap=2):
+    """
+    Compares how much one-step probability skips ahead from episodes with and
+    without each character's storyline.
+    """
+    coo = transitions.tocoo()
+    skips = np.zeros(transitions.shape[0])
+    np.add.at(skips, coo.row, np.where(coo.col - coo.row >= min_gap, coo.data, 0))
+
+    flags = cast.toarray().astype(bool)
+    rates = {}
+    for i, character in enumerate(characters):
+        featured = flags[:, i]
+        rates[character] = {
+            "featured": round(float(skips[featured].mean()), 3) if featured.any() else float("nan"),
+            "not_featured": round(float(skips[~featured].mean()), 3) if (~featured).any() else float("nan"),
+        }
+    return pd.DataFrame(rates).T
+
+
+### Main Function ###
+def analyze_series(series, steps=5, length=5, top_k=10):
+    """
+    Runs the full binge path analysis for one series.
+    """
+    characters = SERIES[series]["characters"]
+    episodes = load_episodes(series)
+    transitions, cast = build_graph(episodes, characters, top_k=top_k)
+    reach = reach_matrix(transitions, steps)
+
+    titles = episodes["title"].values
+    paths = binge_paths(transitions, length)
+    skips = skip_to(reach, episodes["rating"].values)
+
+    episodes["binge_path"] = [[titles[j] for j in row[1:] if j >= 0] for row in paths]
+    episodes["skip_to"] = [[titles[j] for j in row if j >= 0] for row in skips]
+
+    return {
+        "episodes": episodes,
+        "transitions": transitions,
+        "reach": reach,
+        "skip_rates": skip_rates(transitions, cast, characters),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binge path and skip-to analysis per series.")
+    parser.add_argument("--series", nargs="+", default=list(SERIES), choices=list(SERIES))
+    parser.add_argument("--steps", type=int, default=5, help="Random walk length for reach.")
+    parser.add_argument("--length", type=int, default=5, help="Episodes per binge path.")
+    parser.add_argument("--top-k", type=int, default=10, help="Edges kept per episode.")
+    args = parser.parse_args()
+
+    for series in args.series:
+        result = analyze_series(series, args.steps, args.length, args.top_k)
+        episodes = result["episodes"]
+        best = episodes.nlargest(3, "rating")
+
+        print(f"=== {series.capitalize()} ({len(episodes)} episodes) ===")
+        for _, episode in best.iterrows():
+            print(f"{episode.title}: binge {' -> '.join(episode.binge_path)}")
+            print(f"    skip to: {', '.join(episode.skip_to)}")
+        print("Share of next-episode probability that skips ahead:")
+        print(result["skip_rates"].sort_values("featured", ascending=False))
+        print()
+
+
+if __name__ == "__main__":
+    main()
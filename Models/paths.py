@@ -0,0 +1,12 @@
+### Required Libraries ###
+from pathlib import Path
+
+# Paths are resolved from the repo root so the scripts run from anywhere
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESOURCES_DIR = REPO_ROOT / "Resources"
+IMAGES_DIR = REPO_ROOT / "Images"
+CUI_DIR = REPO_ROOT / "Converstional User Interface (CUI)"
+
+OFFICE_CSV = RESOURCES_DIR / "the_office_series.csv"
+FRIENDS_CSV = RESOURCES_DIR / "friends_episodes_v3.csv"
+TV_SHOWS_CSV = RESOURCES_DIR / "tv_shows.csv"
@@ -0,0 +1,333 @@
+### Required Libraries ###
+import argparse
+import hashlib
+import inspect
+import json
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import rating_model
+import report_generator
+from paths import IMAGES_DIR, OFFICE_CSV
+from rating_model import TOP_WORDS, build_features, train_model
+from report_generator import (
+    CHARACTERS,
+    MODEL_IMAGES,
+    MODEL_PARAMS,
+    artifact_names,
+    character_jobs,
+    compute_character_report,
+    count_mentions,
+    fit_count_model,
+    model_points,
+    render_artifact,
+    score_sentiment,
+)
+
+CACHE_DIR = Path(__file__).resolve().parent / ".pipeline_cache"
+
+TFIDF_MODEL_PARAMS = {"n_episodes": 50, "n_estimators": 1000, "random_state": 48}
+
+STAGES = {}
+
+
+def stage(name, deps=(), files=(), code=(), outputs=(), **params):
+    """
+    Registers a function as a named pipeline stage.
+
+    The function receives the outputs of deps in order, followed by params as
+    keyword arguments. Files are hashed into the cache key without being read
+    by the runner. Code lists the helper modules the stage calls into, whose
+    source is hashed alongside the stage's own. Outputs lists files the stage
+    writes as a side effect; a cached stage reruns if any of them is missing
+    or was changed since it ran.
+    """
+    def register(func):
+        STAGES[name] = {
+            "func": func,
+            "deps": list(deps),
+            "files": [str(f) for f in files],
+            "code": list(code),
+            "outputs": [str(f) for f in outputs],
+            "params": params,
+        }
+        return func
+
+    return register
+
+
+### Stages ###
+@stage("load", files=[OFFICE_CSV], path=str(OFFICE_CSV))
+def load(path):
+    """
+    Reads the Office episodes once for every downstream stage.
+    """
+    return pd.read_csv(path)
+
+
+@stage("preprocess", deps=["load"])
+def preprocess(the_office_df):
+    """
+    Keeps the analysis columns and drops episodes without a description.
+    """
+    df = the_office_df[["EpisodeTitle", "About", "Ratings", "Viewership", "Date"]]
+    return df[df["About"].apply(lambda x: isinstance(x, str))].reset_index(drop=True)
+
+
+@stage("features", deps=["preprocess"], code=[report_generator, rating_model])
+def features(office_df):
+    """
+    Adds character mention counts and the top 5 TF-IDF word flags.
+    """
+    df = office_df.copy()
+    for character, names in CHARACTERS.items():
+        df[f"{character}_count"] = [count_mentions(text, names) for text in df["About"]]
+    return df.join(build_features(df["About"]))
+
+
+@stage("sentiment", deps=["preprocess"], code=[report_generator])
+def sentiment(office_df):
+    """
+    Scores every episode description with VADER.
+    """
+    return score_sentiment(office_df)
+
+
+def count_model(features_df, character, n_estimators, random_state):
+    """
+    Fits the random forest of rating on one character's mention count.
+    """
+    return fit_count_model(
+        features_df["Ratings"],
+        features_df[f"{character}_count"],
+        n_estimators=n_estimators,
+        random_state=random_state,
+    )
+
+
+@stage("model_tfidf", deps=["features"], code=[rating_model], **TFIDF_MODEL_PARAMS)
+def model_tfidf(features_df, n_episodes, n_estimators, random_state):
+    """
+    Fits the top-5 TF-IDF words ratings model on the highest rated episodes.
+    """
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import train_test_split
+
+    top_episodes = features_df.nlargest(n_episodes, "Ratings")
+    rf = train_model(top_episodes, n_estimators=n_estimators, random_state=random_state)
+
+    # Held out split as in the notebook; the forest itself saw every top episode
+    X_train, X_test, y_train, y_test = train_test_split(
+        top_episodes[TOP_WORDS], top_episodes["Ratings"].values, random_state=random_state
+    )
+    predicted = rf.predict(X_test)
+
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y_test, predicted))),
+        "ratings": pd.DataFrame({"Real Ratings": y_test, "Predicted Ratings": predicted}),
+    }
+
+
+def character_report(features_df, sentiment_df, model, character, output_dir):
+    """
+    Builds one character's report and draws its figures, including the fitted
+    model curve, with report_generator.
+    """
+    avg_rating = round(features_df.Ratings.mean(), 2)
+    report = compute_character_report(features_df["Ratings"], sentiment_df, character)
+    points = model_points(features_df["Ratings"], features_df[f"{character}_count"], model["curve"])
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    jobs = character_jobs(character, report["correlation"], report["avg_by_count"], avg_rating, output_dir, points)
+    for job in jobs:
+        render_artifact(job)
+
+    report["avg_rating"] = avg_rating
+    report["rmse"] = model["rmse"]
+    return report
+
+
+# One independent model and report branch per character
+for _character in CHARACTERS:
+    stage(
+        f"model_{_character}",
+        deps=["features"],
+        code=[report_generator],
+        character=_character,
+        **MODEL_PARAMS[_character],
+    )(count_model)
+    stage(
+        f"report_{_character}",
+        deps=["features", "sentiment", f"model_{_character}"],
+        code=[report_generator],
+        outputs=[IMAGES_DIR / name for name in artifact_names(_character) + [MODEL_IMAGES[_character]]],
+        character=_character,
+        output_dir=str(IMAGES_DIR),
+    )(character_report)
+
+
+### Runner Helper Functions ###
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_key(name, dep_digests):
+    """
+    Hashes a stage's code, parameters, input files and upstream outputs.
+    """
+    spec = STAGES[name]
+    digest = hashlib.sha256()
+    digest.update(name.encode())
+    digest.update(inspect.getsource(spec["func"]).encode())
+    for module in spec["code"]:
+        digest.update(inspect.getsource(module).encode())
+    digest.update(json.dumps(spec["params"], sort_keys=True, default=str).encode())
+    for path in spec["files"]:
+        digest.update(hash_file(path).encode())
+    for dep in spec["deps"]:
+        digest.update(dep_digests[dep].encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_paths(cache_dir, name, key):
+    base = Path(cache_dir) / f"{name}-{key}"
+    return base.with_suffix(".pkl"), base.with_suffix(".sha256"), base.with_suffix(".outputs.json")
+
+
+def outputs_current(name, outputs_path):
+    """
+    Checks that the files a stage wrote still exist with the same contents.
+    """
+    outputs = STAGES[name]["outputs"]
+    if not outputs:
+        return True
+    if not outputs_path.exists():
+        return False
+    recorded = json.loads(outputs_path.read_text())
+    return all(Path(path).exists() and recorded.get(path) == hash_file(path) for path in outputs)
+
+
+def load_output(path):
+    """
+    Loads a cached stage output.
+    """
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def execute_stage(name, key, dep_paths, cache_dir):
+    """
+    Runs one stage in a worker process and caches its output.
+
+    Returns the digest of the output, so downstream keys only change when the
+    output actually does.
+    """
+    spec = STAGES[name]
+    inputs = [load_output(path) for path in dep_paths]
+    output = spec["func"](*inputs, **spec["params"])
+
+    data = pickle.dumps(output)
+    output_digest = hashlib.sha256(data).hexdigest()
+    output_path, digest_path, outputs_path = cache_paths(cache_dir, name, key)
+    output_path.write_bytes(data)
+    digest_path.write_text(output_digest)
+    if spec["outputs"]:
+        outputs_path.write_text(json.dumps({path: hash_file(path) for path in spec["outputs"]}))
+    return output_digest
+
+
+def required_stages(targets):
+    """
+    Returns the targets and everything upstream of them.
+    """
+    needed = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage {name}")
+        if name not in needed:
+            needed.add(name)
+            stack.extend(STAGES[name]["deps"])
+    return needed
+
+
+### Main Function ###
+def run_pipeline(targets=None, cache_dir=CACHE_DIR, workers=None, force=False):
+    """
+    Runs the stages needed for targets, reusing cached outputs where possible.
+
+    Stages start as soon as their inputs are ready, so independent branches
+    run side by side in the process pool. Returns a dict of stage name to
+    (status, cache path).
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    pending = required_stages(targets or list(STAGES))
+
+    digests = {}
+    results = {}
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            ready = [name for name in sorted(pending) if all(dep in digests for dep in STAGES[name]["deps"])]
+            for name in ready:
+                pending.remove(name)
+                key = stage_key(name, digests)
+                output_path, digest_path, outputs_path = cache_paths(cache_dir, name, key)
+                if (
+                    not force
+                    and output_path.exists()
+                    and digest_path.exists()
+                    and outputs_current(name, outputs_path)
+                ):
+                    digests[name] = digest_path.read_text()
+                    results[name] = ("cached", output_path)
+                    continue
+                dep_paths = [results[dep][1] for dep in STAGES[name]["deps"]]
+                future = executor.submit(execute_stage, name, key, dep_paths, cache_dir)
+                running[future] = (name, output_path)
+
+            # Cached stages may have unblocked others, so look again before waiting
+            if ready and not running:
+                continue
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, output_path = running.pop(future)
+                digests[name] = future.result()
+                results[name] = ("ran", output_path)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Office analysis stages as a cached DAG.")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all).")
+    parser.add_argument("--force", action="store_true", help="Ignore cached outputs.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--list", action="store_true", help="List the stages and exit.")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in STAGES.items():
+            print(f"{name} <- {', '.join(spec['deps']) or '-'}")
+        return
+
+    results = run_pipeline(args.targets, workers=args.workers, force=args.force)
+    for name, (status, path) in results.items():
+        print(f"{status:>6}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+### Required Libraries ###
+import argparse
+import json
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from paths import OFFICE_CSV
+
+# Top 5 TF-IDF words used as features in the_office_nlp.ipynb, in bit order
+TOP_WORDS = ["Michael", "Dwight", "Jim", "Office", "Andy"]
+
+
+def build_features(about):
+    """
+    Flags which top words appear in each description, as in the notebook.
+    """
+    return pd.DataFrame(
+        {word: about.str.contains(word).astype(int) for word in TOP_WORDS},
+        index=about.index,
+    )
+
+
+def load_top_episodes(csv_path=OFFICE_CSV, n_episodes=50):
+    """
+    Reads the highest rated episodes the model is trained on.
+    """
+    the_office_df = pd.read_csv(csv_path, usecols=["EpisodeTitle", "About", "Ratings"])
+    return the_office_df.nlargest(n_episodes, "Ratings")
+
+
+def train_model(top_episodes, n_estimators=1000, random_state=48):
+    """
+    Fits the top-5 TF-IDF ratings model on the given episodes.
+    """
+    X = build_features(top_episodes["About"])
+    y = top_episodes["Ratings"].values
+
+    rf = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state)
+    rf.fit(X, y)
+    return rf
+
+
+def export_lookup_table(rf):
+    """
+    Scores every combination of flags once.
+
+    With five binary features there are only 32 possible inputs, so the whole
+    forest collapses into a table keyed by the flag bitmask (bit i set when
+    TOP_WORDS[i] appears). Serving is then a dictionary lookup.
+    """
+    combinations = np.array(list(product([0, 1], repeat=len(TOP_WORDS))))
+    predictions = rf.predict(pd.DataFrame(combinations, columns=TOP_WORDS))
+
+    table = {}
+    for flags, prediction in zip(combinations, predictions):
+        mask = sum(int(flag) << i for i, flag in enumerate(flags))
+        table[mask] = round(float(prediction), 2)
+    return dict(sorted(table.items()))
+
+
+### Main Function ###
+def main():
+    parser = argparse.ArgumentParser(description="Train the ratings model and export its lookup table.")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the lookup table.")
+    args = parser.parse_args()
+
+    table = export_lookup_table(train_model(load_top_episodes()))
+
+    # Printed as a literal to paste into the Lambda function
+    print("RATING_TABLE = {")
+    for mask, rating in table.items():
+        words = [word for i, word in enumerate(TOP_WORDS) if mask >> i & 1]
+        print(f"    {mask}: {rating},  # {', '.join(words) if words else 'none'}")
+    print("}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"words": TOP_WORDS, "table": table}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
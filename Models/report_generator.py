@@ -0,0 +1,460 @@
+### Required Libraries ###
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from paths import IMAGES_DIR, OFFICE_CSV
+from term_frequency import build_frequencies, build_word_cloud
+
+MANIFEST_NAME = ".report_manifest.json"
+
+# Bump when a renderer changes so every artifact is redrawn once
+RENDER_VERSION = "1"
+
+# Words counted per character, matching the notebook's split(' ') loops
+CHARACTERS = {
+    "michael": ["Michael", "Michael's"],
+    "dwight": ["Dwight", "Dwight's"],
+    "bulk": ["Dwight", "Dwight's", "Michael", "Michael's"],
+}
+
+# Image file prefixes already used in Images/
+IMAGE_PREFIX = {"michael": "mc", "dwight": "dw", "bulk": "combined"}
+
+# Model plot names already used in Images/ (combined_mdoel is the existing spelling)
+MODEL_IMAGES = {"michael": "mc_model.PNG", "dwight": "dw_model.PNG", "bulk": "combined_mdoel.PNG"}
+
+# Random forest settings of the notebook's per character count models
+MODEL_PARAMS = {
+    "michael": {"n_estimators": 500, "random_state": 78},
+    "dwight": {"n_estimators": 500, "random_state": 78},
+    "bulk": {"n_estimators": 500, "random_state": 78},
+}
+
+SENTIMENT_COLUMNS = ["compound", "positive", "negative", "neutral"]
+
+
+### Data Helper Functions ###
+def load_office(path=OFFICE_CSV):
+    """
+    Reads the Office episodes once with only the columns the reports need.
+    """
+    return pd.read_csv(
+        path, usecols=["EpisodeTitle", "About", "Ratings", "Viewership", "Date"]
+    )
+
+
+def count_mentions(text, names):
+    """
+    Counts how many space separated words of the text are in names.
+    """
+    return sum(1 for word in text.split(" ") if word in names)
+
+
+def score_sentiment(office_df, analyzer=None):
+    """
+    Scores every episode description with VADER and counts each character.
+
+    Sentiment is computed once per episode and shared by every character,
+    instead of once per character as in the notebook loops.
+    """
+    if analyzer is None:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+        analyzer = SentimentIntensityAnalyzer()
+
+    rows = []
+    for text, date in zip(office_df["About"], office_df["Date"]):
+        if not isinstance(text, str):
+            continue
+        sentiment = analyzer.polarity_scores(text)
+        row = {
+            "date": date,
+            "text": text,
+            "compound": sentiment["compound"],
+            "positive": sentiment["pos"],
+            "negative": sentiment["neg"],
+            "neutral": sentiment["neu"],
+        }
+        for character, names in CHARACTERS.items():
+            row[f"{character}_count"] = count_mentions(text, names)
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def average_by_count(ratings, counts):
+    """
+    Returns the average rating for each mention count, rounded like the notebook.
+    """
+    return ratings.groupby(counts).mean().round(2)
+
+
+def compute_character_report(ratings, sentiment_df, character):
+    """
+    Computes one character's sentiment correlation and average rating per count.
+
+    Ratings must be aligned to the rows of sentiment_df.
+    """
+    count_column = f"{character}_count"
+    return {
+        "correlation": sentiment_df[SENTIMENT_COLUMNS + [count_column]].corr(),
+        "avg_by_count": average_by_count(ratings, sentiment_df[count_column]),
+    }
+
+
+### Model Helper Functions ###
+def fit_count_model(ratings, counts, n_estimators=500, random_state=78):
+    """
+    Fits a random forest of rating on one character's mention count.
+
+    Returns the test RMSE and the predicted rating for every count up to the
+    highest one seen, for plotting the fitted curve.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    X = counts.to_frame()
+    y = ratings.values
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=random_state)
+    X_scaler = StandardScaler().fit(X_train)
+
+    rf_model = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state)
+    rf_model.fit(X_scaler.transform(X_train), y_train)
+    predictions = rf_model.predict(X_scaler.transform(X_test))
+
+    grid = np.arange(0, counts.max() + 1)
+    curve = rf_model.predict(X_scaler.transform(pd.DataFrame({counts.name: grid})))
+
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y_test, predictions))),
+        "curve": pd.Series(curve, index=grid, name="Predicted Rating"),
+    }
+
+
+def model_points(ratings, counts, curve):
+    """
+    Lines up every episode's count and rating with the model's prediction.
+    """
+    return pd.DataFrame({
+        "Count": counts.values,
+        "Rating": ratings.values,
+        "Predicted": curve.reindex(counts.values).values,
+    })
+
+
+def compute_report(office_df, sentiment_df):
+    """
+    Computes every correlation matrix, aggregate and count model in a single pass.
+    """
+    avg_rating = round(office_df.Ratings.mean(), 2)
+    avg_views = round(office_df.Viewership.mean(), 2)
+
+    # Ratings aligned to the scored rows (rows without a description are skipped)
+    ratings = office_df.loc[office_df["About"].apply(lambda x: isinstance(x, str)), "Ratings"]
+    ratings = ratings.reset_index(drop=True)
+
+    correlations = {}
+    avg_by_count = {}
+    models = {}
+    for character in CHARACTERS:
+        character_report = compute_character_report(ratings, sentiment_df, character)
+        correlations[character] = character_report["correlation"]
+        avg_by_count[character] = character_report["avg_by_count"]
+
+        counts = sentiment_df[f"{character}_count"]
+        model = fit_count_model(ratings, counts, **MODEL_PARAMS[character])
+        models[character] = model_points(ratings, counts, model["curve"])
+
+    # Side by side count correlations, as in the notebook's combined table
+    combined = pd.concat(
+        [correlations[character][f"{character}_count"] for character in CHARACTERS],
+        axis=1,
+    ).dropna()
+
+    return {
+        "avg_rating": avg_rating,
+        "avg_views": avg_views,
+        "correlations": correlations,
+        "combined_correlation": combined,
+        "avg_by_count": avg_by_count,
+        "models": models,
+        "frequencies": pd.Series(build_frequencies(office_df["About"].dropna())),
+    }
+
+
+### Rendering Helper Functions ###
+def render_heatmap(data, title, path):
+    """
+    Saves a correlation heatmap.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(data, cmap="Blues", annot=True, ax=ax)
+    ax.set_title(title, fontsize=16, fontweight="bold")
+    fig.tight_layout()
+    # Drop the software tag so identical data gives identical bytes
+    fig.savefig(path, metadata={"Software": None})
+    plt.close(fig)
+
+
+def render_threshold_bars(data, title, path, threshold):
+    """
+    Saves the average rating per mention count against the overall average.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    values = data.values
+    x = range(len(values))
+
+    # split it up
+    above_threshold = np.maximum(values - threshold, 0)
+    below_threshold = np.minimum(values, threshold)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(x, below_threshold, 0.35, color="g")
+    ax.bar(x, above_threshold, 0.35, color="r", bottom=below_threshold)
+
+    # horizontal line indicating the threshold
+    ax.plot([-0.5, len(values) - 0.5], [threshold, threshold], "k--")
+    ax.set_xticks(list(x))
+    ax.set_xticklabels([str(count) for count in data.index])
+    ax.set_xlabel("Mention Count")
+    ax.set_ylabel("Average Rating")
+    ax.set_title(title, fontsize=16, fontweight="bold")
+    fig.tight_layout()
+    fig.savefig(path, metadata={"Software": None})
+    plt.close(fig)
+
+
+def render_model(data, title, path):
+    """
+    Saves the ratings against mention count with the model's fitted steps.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    curve = data.drop_duplicates("Count").sort_values("Count")
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.scatter(data["Count"], data["Rating"], color="red", label="Rating")
+    ax.plot(curve["Count"], curve["Predicted"], color="blue", drawstyle="steps-mid", label="Predicted Rating")
+    ax.set_xlabel("Mention Count")
+    ax.set_ylabel("Rating")
+    ax.set_title(title, fontsize=16, fontweight="bold")
+    ax.legend(loc="lower right")
+    fig.tight_layout()
+    fig.savefig(path, metadata={"Software": None})
+    plt.close(fig)
+
+
+def render_word_cloud(data, title, path, width, height):
+    """
+    Saves a word cloud of the term frequencies; the title is not drawn.
+    """
+    # Fixed layout seed so identical frequencies give identical bytes
+    build_word_cloud(data.to_dict(), width=width, height=height, random_state=0).to_file(path)
+
+
+RENDERERS = {
+    "heatmap": render_heatmap,
+    "threshold_bars": render_threshold_bars,
+    "model": render_model,
+    "word_cloud": render_word_cloud,
+}
+
+
+def render_artifact(job):
+    """
+    Renders one artifact; runs inside a worker process.
+    """
+    RENDERERS[job["kind"]](job["data"], job["title"], job["path"], **job["options"])
+    return job["name"]
+
+
+def artifact_names(character):
+    """
+    Returns the figure file names drawn for one character.
+    """
+    prefix = IMAGE_PREFIX[character]
+    return [f"{prefix}_corr.PNG", f"{prefix}_avgrating.PNG"]
+
+
+def character_jobs(character, correlation, avg_by_count, avg_rating, output_dir, model=None):
+    """
+    Lists the figures to draw for one character.
+
+    The model plot is only listed when the character's model_points are given.
+    """
+    title = character.capitalize()
+    corr_name, avgrating_name = artifact_names(character)
+    jobs = [
+        {
+            "name": corr_name,
+            "kind": "heatmap",
+            "title": f"{title} Sentiment Correlation",
+            "data": correlation,
+            "options": {},
+        },
+        {
+            "name": avgrating_name,
+            "kind": "threshold_bars",
+            "title": f"{title} Average Rating per Mention Count",
+            "data": avg_by_count,
+            "options": {"threshold": avg_rating},
+        },
+    ]
+    if model is not None:
+        jobs.append({
+            "name": MODEL_IMAGES[character],
+            "kind": "model",
+            "title": f"Model {title}",
+            "data": model,
+            "options": {},
+        })
+    for job in jobs:
+        job["path"] = str(Path(output_dir) / job["name"])
+    return jobs
+
+
+def build_jobs(report, output_dir):
+    """
+    Lists every figure to draw from a computed report.
+
+    Covers the per character correlation, average rating and model plots, the
+    combined count correlation and the word cloud. The remaining files in
+    Images/ are screenshots of notebook tables and interactive plots, or
+    collages of the figures above, and are still made by hand: *_agg.PNG,
+    corr_agg.PNG, bar_chart.PNG, TF-IDF.png, Cosine-Similarity.png,
+    Episode-Reccomendation.png and the two Predicted_Ratings_*.png tables.
+    """
+    jobs = []
+    for character in CHARACTERS:
+        jobs.extend(character_jobs(
+            character,
+            report["correlations"][character],
+            report["avg_by_count"][character],
+            report["avg_rating"],
+            output_dir,
+            report["models"][character],
+        ))
+    jobs.append({
+        "name": "corr_agg_combined.PNG",
+        "kind": "heatmap",
+        "title": "Combined Count Correlation",
+        "data": report["combined_correlation"],
+        "options": {},
+        "path": str(Path(output_dir) / "corr_agg_combined.PNG"),
+    })
+    jobs.append({
+        "name": "wordcloud.PNG",
+        "kind": "word_cloud",
+        "title": "Episode Description Word Cloud",
+        "data": report["frequencies"],
+        "options": {"width": 1600, "height": 800},
+        "path": str(Path(output_dir) / "wordcloud.PNG"),
+    })
+    return jobs
+
+
+### Cache Helper Functions ###
+def hash_job(job):
+    """
+    Hashes the inputs of an artifact: its data, title, options and renderer version.
+    """
+    digest = hashlib.sha256()
+    digest.update(RENDER_VERSION.encode())
+    digest.update(job["kind"].encode())
+    digest.update(job["title"].encode())
+    digest.update(json.dumps(job["options"], sort_keys=True).encode())
+    digest.update(job["data"].to_csv().encode())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir):
+    """
+    Reads the artifact hashes written by the previous run, if any.
+    """
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir, manifest):
+    """
+    Writes the artifact hashes for the next run.
+    """
+    with open(Path(output_dir) / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+### Main Function ###
+def generate_reports(output_dir=IMAGES_DIR, csv_path=OFFICE_CSV, force=False, workers=None, analyzer=None):
+    """
+    Computes the report once and redraws only the artifacts whose inputs changed.
+
+    Returns the computed report and the names of the figures that were redrawn.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    office_df = load_office(csv_path)
+    sentiment_df = score_sentiment(office_df, analyzer)
+    report = compute_report(office_df, sentiment_df)
+
+    manifest = {} if force else load_manifest(output_dir)
+    jobs = build_jobs(report, output_dir)
+
+    stale = []
+    for job in jobs:
+        job_hash = hash_job(job)
+        if manifest.get(job["name"]) != job_hash or not Path(job["path"]).exists():
+            stale.append(job)
+        manifest[job["name"]] = job_hash
+
+    rendered = []
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_artifact, stale))
+
+    save_manifest(output_dir, manifest)
+    return report, rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the report figures in Images/.")
+    parser.add_argument("--output-dir", default=str(IMAGES_DIR), help="Directory to write figures to.")
+    parser.add_argument("--force", action="store_true", help="Redraw every figure even if unchanged.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of render processes.")
+    args = parser.parse_args()
+
+    report, rendered = generate_reports(args.output_dir, force=args.force, workers=args.workers)
+
+    print(f"Average Rating per episode is: {report['avg_rating']}/10 & The Average Number of Views is: {report['avg_views']} Million")
+    for character, averages in report["avg_by_count"].items():
+        print(f"{character.capitalize()} average rating per mention count: {averages.to_dict()}")
+    print(f"Redrew {len(rendered)} figure(s): {', '.join(rendered) if rendered else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
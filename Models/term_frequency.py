@@ -0,0 +1,209 @@
+### Required Libraries ###
+import argparse
+import hashlib
+import heapq
+import re
+from collections import Counter
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from paths import OFFICE_CSV
+
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def default_stopwords():
+    """
+    Returns the WordCloud stop words, falling back to NLTK's English list.
+    """
+    try:
+        from wordcloud import STOPWORDS
+
+        return set(STOPWORDS)
+    except ImportError:
+        from nltk.corpus import stopwords
+
+        return set(stopwords.words("english"))
+
+
+def make_tokenizer(stop_words=None):
+    """
+    Builds a lowercase word tokenizer that drops stop words and one letter words.
+
+    Any callable taking a string and returning tokens can be used in its place,
+    e.g. the notebooks' NLTK tokenizer.
+    """
+    if stop_words is None:
+        stop_words = default_stopwords()
+
+    def tokenize(text):
+        words = WORD_PATTERN.findall(text.lower())
+        # Fold possessives so "michael's" counts as "michael"
+        words = [word[:-2] if word.endswith("'s") else word for word in words]
+        return [word for word in words if len(word) > 1 and word not in stop_words]
+
+    return tokenize
+
+
+### Counters ###
+class CountMinSketch:
+    """
+    Approximate term counter with a fixed memory footprint.
+
+    Counts live in a depth x width table, so memory does not grow with the
+    vocabulary. Only the max_terms heaviest terms are remembered by name, which
+    is all a word cloud needs. Estimates never undercount.
+    """
+
+    def __init__(self, width=2 ** 16, depth=4, max_terms=200):
+        self.width = width
+        self.depth = depth
+        self.max_terms = max_terms
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.rows = np.arange(depth)
+        self.heavy = {}
+        # Min-heap of (estimate, term); entries go stale when a term's estimate grows
+        self.heap = []
+
+    def _columns(self, terms):
+        # One digest per term, split into depth 32-bit column indexes
+        digests = b"".join(
+            hashlib.blake2b(term.encode("utf-8"), digest_size=4 * self.depth).digest()
+            for term in terms
+        )
+        columns = np.frombuffer(digests, dtype=np.uint32).reshape(len(terms), self.depth)
+        return columns % self.width
+
+    def add(self, term, count=1):
+        self.update({term: count})
+
+    def update(self, terms):
+        """
+        Adds a batch of terms, given as an iterable of terms or a term -> count
+        mapping. Repeats are merged first, so each distinct term is hashed once
+        and every sketch row is updated with a single np.add.at.
+        """
+        counts = terms if isinstance(terms, Mapping) else Counter(terms)
+        if not counts:
+            return
+        names = list(counts)
+        columns = self._columns(names)
+        added = np.fromiter(counts.values(), dtype=np.int64, count=len(names))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[:, row], added)
+        estimates = self.table[self.rows, columns].min(axis=1)
+
+        for term, estimate in zip(names, estimates.tolist()):
+            self._offer(term, estimate)
+
+    def _offer(self, term, estimate):
+        # Keep the heaviest terms by name, evicting the lightest when full
+        if term in self.heavy or len(self.heavy) < self.max_terms:
+            self._track(term, estimate)
+            return
+        lightest_estimate, lightest = self._lightest()
+        if estimate > lightest_estimate:
+            heapq.heappop(self.heap)
+            del self.heavy[lightest]
+            self._track(term, estimate)
+
+    def _track(self, term, estimate):
+        self.heavy[term] = estimate
+        heapq.heappush(self.heap, (estimate, term))
+        # Rebuild once stale entries outnumber live ones, keeping pushes O(log k)
+        if len(self.heap) > 2 * self.max_terms:
+            self.heap = [(value, name) for name, value in self.heavy.items()]
+            heapq.heapify(self.heap)
+
+    def _lightest(self):
+        while self.heavy.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0]
+
+    def estimate(self, term):
+        return int(self.table[self.rows, self._columns([term])[0]].min())
+
+    def most_common(self, n=None):
+        n = len(self.heavy) if n is None else n
+        return heapq.nlargest(n, self.heavy.items(), key=lambda item: item[1])
+
+
+### Streaming Helper Functions ###
+def iter_documents(csv_path=OFFICE_CSV, column="About", chunksize=1000):
+    """
+    Yields one text column of a CSV a chunk at a time, skipping empty rows.
+    """
+    for chunk in pd.read_csv(csv_path, usecols=[column], chunksize=chunksize):
+        for text in chunk[column]:
+            if isinstance(text, str):
+                yield text
+
+
+def build_frequencies(documents, tokenizer=None, counter=None, max_words=200, batch_size=1000):
+    """
+    Streams documents through the tokenizer into a term counter.
+
+    Uses an exact Counter by default; pass a CountMinSketch to bound memory on
+    large corpora. Tokens are first counted locally per batch_size documents,
+    so the counter receives one update per distinct term per batch. Returns
+    the max_words most frequent terms as a dict, ready for
+    WordCloud.generate_from_frequencies.
+    """
+    if tokenizer is None:
+        tokenizer = make_tokenizer()
+    if counter is None:
+        counter = Counter()
+
+    batch = Counter()
+    for i, text in enumerate(documents, 1):
+        batch.update(tokenizer(text))
+        if i % batch_size == 0:
+            counter.update(batch)
+            batch = Counter()
+    counter.update(batch)
+
+    return dict(counter.most_common(max_words))
+
+
+def build_word_cloud(frequencies, **kwargs):
+    """
+    Creates a word cloud from precomputed term frequencies.
+    """
+    from wordcloud import WordCloud
+
+    return WordCloud(**kwargs).generate_from_frequencies(frequencies)
+
+
+### Main Function ###
+def main():
+    parser = argparse.ArgumentParser(description="Build a word cloud from streamed term frequencies.")
+    parser.add_argument("--csv", default=str(OFFICE_CSV), help="CSV file to read.")
+    parser.add_argument("--column", default="About", help="Text column to count.")
+    parser.add_argument("--output", default=None, help="Image path for the word cloud.")
+    parser.add_argument("--max-words", type=int, default=200, help="Number of terms to keep.")
+    parser.add_argument("--sketch", action="store_true", help="Use a count-min sketch instead of exact counts.")
+    parser.add_argument("--sketch-width", type=int, default=2 ** 16, help="Columns per sketch row.")
+    args = parser.parse_args()
+
+    counter = None
+    if args.sketch:
+        counter = CountMinSketch(width=args.sketch_width, max_terms=args.max_words)
+
+    frequencies = build_frequencies(
+        iter_documents(args.csv, args.column),
+        counter=counter,
+        max_words=args.max_words,
+    )
+
+    for term, count in list(frequencies.items())[:10]:
+        print(f"{term}: {count}")
+
+    if args.output:
+        build_word_cloud(frequencies, width=1600, height=800).to_file(args.output)
+        print(f"Saved word cloud to {args.output}")
+
+
+if __name__ == "__main__":
+    main()